@@ -7,8 +7,9 @@ import os
 import asyncio
 import uuid
 import random
+import sys
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
 from typing import List, Dict, Optional, Annotated
 
 from dotenv import load_dotenv
@@ -50,14 +51,33 @@ SCENARIOS = [
     
 ]
 
+# -------------------------
+# Timestamps
+# -------------------------
+# Cache the formatted "YYYY-MM-DDTHH:MM:SS" prefix per second; history
+# entries only need the sub-second suffix recomputed.
+_TS_CACHE = [-1, ""]
+
+
+def _now_iso() -> str:
+    t = time.time()
+    s = int(t)
+    if s != _TS_CACHE[0]:
+        _TS_CACHE[:] = [s, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(s))]
+    return f"{_TS_CACHE[1]}.{int((t - s) * 1e6):06d}Z"
+
 # -------------------------
 # Per-session Improv State
 # -------------------------
-@dataclass
+# dataclass(slots=True) needs Python 3.10+; the project still supports 3.9.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class Userdata:
     player_name: Optional[str] = None
-    session_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
-    started_at: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    started_at: str = field(default_factory=_now_iso)
     improv_state: Dict = field(default_factory=lambda: {
         "current_round": 0,
         "max_rounds": 3,
@@ -72,7 +92,7 @@ class Userdata:
 # -------------------------
 
 def _pick_scenario(userdata: Userdata) -> str:
-    used = userdata.improv_state.get("used_indices", [])
+    used = set(userdata.improv_state.get("used_indices", []))
     candidates = [i for i in range(len(SCENARIOS)) if i not in used]
     if not candidates:
         # reset if we exhausted scenarios
@@ -89,11 +109,12 @@ def _host_reaction_text(performance: str) -> str:
     tone = random.choice(tones)
     # Quick keyword detection to pick specific highlights (not exhaustive)
     highlights = []
-    if any(w in performance.lower() for w in ("funny", "lol", "hahaha", "haha")):
+    perf = performance.lower()
+    if any(w in perf for w in ("funny", "lol", "hahaha", "haha")):
         highlights.append("great comedic timing")
-    if any(w in performance.lower() for w in ("sad", "cry", "tears")):
+    if any(w in perf for w in ("sad", "cry", "tears")):
         highlights.append("good emotional depth")
-    if any(w in performance.lower() for w in ("pause", "...")):
+    if any(w in perf for w in ("pause", "...")):
         highlights.append("interesting use of silence")
     if not highlights:
         # fallback picks
@@ -133,7 +154,7 @@ async def start_show(
     userdata.improv_state["current_round"] = 0
     userdata.improv_state["rounds"] = []
     userdata.improv_state["phase"] = "intro"
-    userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "start_show", "name": userdata.player_name})
+    userdata.history.append({"time": _now_iso(), "action": "start_show", "name": userdata.player_name})
 
     intro = (
         f"Welcome to Improv Battle! I'm your host — let's get ready to play."
@@ -144,7 +165,7 @@ async def start_show(
     scenario = _pick_scenario(userdata)
     userdata.improv_state["current_round"] = 1
     userdata.improv_state["phase"] = "awaiting_improv"
-    userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "present_scenario", "round": 1, "scenario": scenario})
+    userdata.history.append({"time": _now_iso(), "action": "present_scenario", "round": 1, "scenario": scenario})
 
     return intro + "\nRound 1: " + scenario + "\nStart improvising now!"
 
@@ -166,7 +187,7 @@ async def next_scenario(ctx: RunContext[Userdata]) -> str:
     scenario = _pick_scenario(userdata)
     userdata.improv_state["current_round"] = next_round
     userdata.improv_state["phase"] = "awaiting_improv"
-    userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "present_scenario", "round": next_round, "scenario": scenario})
+    userdata.history.append({"time": _now_iso(), "action": "present_scenario", "round": next_round, "scenario": scenario})
     return f"Round {next_round}: {scenario}\nGo!"
 
 
@@ -178,7 +199,7 @@ async def record_performance(
     userdata = ctx.userdata
     if userdata.improv_state.get("phase") != "awaiting_improv":
         # still accept performance but warn
-        userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "record_performance_out_of_phase"})
+        userdata.history.append({"time": _now_iso(), "action": "record_performance_out_of_phase"})
 
     round_no = userdata.improv_state.get("current_round", 0)
     scenario = userdata.history[-1].get("scenario") if userdata.history and userdata.history[-1].get("action") == "present_scenario" else "(unknown)"
@@ -192,7 +213,7 @@ async def record_performance(
         "reaction": reaction,
     })
     userdata.improv_state["phase"] = "reacting"
-    userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "record_performance", "round": round_no})
+    userdata.history.append({"time": _now_iso(), "action": "record_performance", "round": round_no})
 
     # If we've reached max rounds, change to done after reaction
     if round_no >= userdata.improv_state.get("max_rounds", 3):
@@ -222,9 +243,15 @@ async def summarize_show(ctx: RunContext[Userdata]) -> str:
             perf_snip = perf_snip[:77] + "..."
         summary_lines.append(f"Round {r.get('round')}: {r.get('scenario')} — You: '{perf_snip}' | Host: {r.get('reaction')}")
 
-    # aggregate a simple profile
-    mentions_character = sum(1 for r in rounds if any(w in (r.get('performance') or '').lower() for w in ('i am', "i'm", 'as a', 'character', 'role')))
-    mentions_emotion = sum(1 for r in rounds if any(w in (r.get('performance') or '').lower() for w in ('sad', 'angry', 'happy', 'love', 'cry', 'tears')))
+    # aggregate a simple profile (single pass over rounds)
+    mentions_character = 0
+    mentions_emotion = 0
+    for r in rounds:
+        perf = (r.get('performance') or '').lower()
+        if any(w in perf for w in ('i am', "i'm", 'as a', 'character', 'role')):
+            mentions_character += 1
+        if any(w in perf for w in ('sad', 'angry', 'happy', 'love', 'cry', 'tears')):
+            mentions_emotion += 1
 
     profile = "You seem to be a player who "
     if mentions_character > len(rounds) / 2:
@@ -239,7 +266,7 @@ async def summarize_show(ctx: RunContext[Userdata]) -> str:
     summary_lines.append(profile)
     summary_lines.append("Thanks for performing on Improv Battle — hope to see you again!")
 
-    userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "summarize_show"})
+    userdata.history.append({"time": _now_iso(), "action": "summarize_show"})
     return "\n".join(summary_lines)
 
 
@@ -249,16 +276,14 @@ async def stop_show(ctx: RunContext[Userdata], confirm: Annotated[bool, Field(de
     if not confirm:
         return "Are you sure you want to stop the show? Say 'stop show yes' to confirm."
     userdata.improv_state["phase"] = "done"
-    userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "stop_show"})
+    userdata.history.append({"time": _now_iso(), "action": "stop_show"})
     return "Show stopped. Thanks for coming to Improv Battle!"
 
 
 # -------------------------
 # The Agent (Improv Host)
 # -------------------------
-class GameMasterAgent(Agent):
-    def __init__(self):
-        instructions = """
+_INSTRUCTIONS = """
         You are the host of a TV improv show called 'Improv Battle'.
         Role: High-energy, witty, and clear about rules. Guide a single contestant through a series of short improv scenes.
 
@@ -271,9 +296,16 @@ class GameMasterAgent(Agent):
             - Keep turns short and TTS-friendly.
         Use the provided tools: start_show, next_scenario, record_performance, summarize_show, stop_show.
         """
+
+# Agent.__init__ copies this list, so one shared instance is safe.
+_TOOLS = [start_show, next_scenario, record_performance, summarize_show, stop_show]
+
+
+class GameMasterAgent(Agent):
+    def __init__(self):
         super().__init__(
-            instructions=instructions,
-            tools=[start_show, next_scenario, record_performance, summarize_show, stop_show],
+            instructions=_INSTRUCTIONS,
+            tools=_TOOLS,
         )
 
 # -------------------------